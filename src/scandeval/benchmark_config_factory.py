@@ -51,6 +51,7 @@ def build_benchmark_config(
     only_validation_split: bool,
     few_shot: bool,
     num_iterations: int,
+    max_concurrency: int,
     run_with_cli: bool,
     first_time: bool = False,
 ) -> BenchmarkConfig:
@@ -124,6 +125,8 @@ def build_benchmark_config(
             Whether to use few-shot learning for the models.
         num_iterations:
             The number of iterations each model should be evaluated for.
+        max_concurrency:
+            The maximum number of concurrent requests to send to API-based models.
         run_with_cli:
             Whether the benchmark is being run with the CLI.
         first_time:
@@ -132,7 +135,18 @@ def build_benchmark_config(
 
     Returns:
         The benchmark configuration.
+
+    Raises:
+        InvalidBenchmark:
+            If the maximum number of concurrent requests is less than 1.
     """
+    if max_concurrency < 1:
+        argument_name = "--max-concurrency" if run_with_cli else "max_concurrency"
+        raise InvalidBenchmark(
+            f"The `{argument_name}` argument must be at least 1, but it was "
+            f"{max_concurrency}."
+        )
+
     language_codes = get_correct_language_codes(language_codes=language)
     model_languages = prepare_languages(
         language_codes=model_language, default_language_codes=language_codes
@@ -237,6 +251,7 @@ def build_benchmark_config(
         only_validation_split=only_validation_split,
         few_shot=few_shot,
         num_iterations=num_iterations,
+        max_concurrency=max_concurrency,
         run_with_cli=run_with_cli,
     )
 
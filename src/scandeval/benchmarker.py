@@ -19,7 +19,12 @@ from .dataset_factory import DatasetFactory
 from .enums import Device, Framework
 from .exceptions import InvalidBenchmark, InvalidModel
 from .types import ScoreDict
-from .utils import get_huggingface_model_lists
+from .utils import (
+    block_terminal_output,
+    configure_logging,
+    configure_runtime_environment,
+    get_huggingface_model_lists,
+)
 
 if TYPE_CHECKING:
     from .config import DatasetConfig, Language
@@ -61,6 +66,7 @@ class BenchmarkConfigParams(BaseModel):
     only_validation_split: bool
     few_shot: bool
     num_iterations: int
+    max_concurrency: int
     run_with_cli: bool
 
 
@@ -172,6 +178,7 @@ class Benchmarker:
         only_validation_split: bool = False,
         few_shot: bool = True,
         num_iterations: int = 10,
+        max_concurrency: int = 32,
         run_with_cli: bool = False,
     ) -> None:
         """Initialise the benchmarker.
@@ -268,6 +275,9 @@ class Benchmarker:
                 The number of times each model should be evaluated. This is only meant
                 to be used for power users, and scores will not be allowed on the
                 leaderboards if this is changed. Defaults to 10.
+            max_concurrency:
+                The maximum number of concurrent requests to send to API-based models,
+                such as the OpenAI models. Defaults to 32.
             run_with_cli:
                 Whether the benchmarker is being run from the command-line interface.
                 Defaults to False.
@@ -279,6 +289,12 @@ class Benchmarker:
         if task is not None and dataset is not None:
             raise ValueError("Only one of `task` and `dataset` can be specified.")
 
+        # This is done here rather than when the package is imported, to avoid changing
+        # the setup of applications which only import ScandEval
+        block_terminal_output()
+        configure_logging()
+        configure_runtime_environment()
+
         self.benchmark_config_default_params = BenchmarkConfigParams(
             progress_bar=progress_bar,
             save_results=save_results,
@@ -308,6 +324,7 @@ class Benchmarker:
             only_validation_split=only_validation_split,
             few_shot=few_shot,
             num_iterations=num_iterations,
+            max_concurrency=max_concurrency,
             run_with_cli=run_with_cli,
         )
 
@@ -367,6 +384,7 @@ class Benchmarker:
         only_validation_split: bool | None = None,
         few_shot: bool | None = None,
         num_iterations: int | None = None,
+        max_concurrency: int | None = None,
     ) -> list[BenchmarkResult]:
         """Benchmarks models on datasets.
 
@@ -478,6 +496,10 @@ class Benchmarker:
                 to be used for power users, and scores will not be allowed on the
                 leaderboards if this is changed. Defaults to the value specified when
                 initialising the benchmarker.
+            max_concurrency:
+                The maximum number of concurrent requests to send to API-based models,
+                such as the OpenAI models. Defaults to the value specified when
+                initialising the benchmarker.
 
         Returns:
             A list of benchmark results.
@@ -546,6 +568,8 @@ class Benchmarker:
             benchmark_config_params.few_shot = few_shot
         if num_iterations is not None:
             benchmark_config_params.num_iterations = num_iterations
+        if max_concurrency is not None:
+            benchmark_config_params.max_concurrency = max_concurrency
 
         benchmark_config = build_benchmark_config(
             **benchmark_config_params.model_dump()
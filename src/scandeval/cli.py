@@ -250,6 +250,14 @@ from .tasks import get_all_tasks
     be used for power users, and scores will not be allowed on the leaderboards if this
     is changed.""",
 )
+@click.option(
+    "--max-concurrency",
+    default=32,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="""The maximum number of concurrent requests to send to API-based models, such
+    as the OpenAI models. Lower this if you are being rate limited.""",
+)
 def benchmark(
     model: tuple[str],
     dataset: tuple[str],
@@ -281,6 +289,7 @@ def benchmark(
     only_validation_split: bool,
     few_shot: bool,
     num_iterations: int,
+    max_concurrency: int,
 ) -> None:
     """Benchmark pretrained language models on language tasks."""
     # Set up language variables
@@ -324,6 +333,7 @@ def benchmark(
         only_validation_split=only_validation_split,
         few_shot=few_shot,
         num_iterations=num_iterations,
+        max_concurrency=max_concurrency,
         run_with_cli=True,
     )
 
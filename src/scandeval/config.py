@@ -159,6 +159,8 @@ class BenchmarkConfig:
             if the model is generative.
         num_iterations:
             The number of iterations each model should be evaluated for.
+        max_concurrency:
+            The maximum number of concurrent requests to send to API-based models.
         run_with_cli:
             Whether the benchmark is being run with the CLI.
     """
@@ -189,6 +191,7 @@ class BenchmarkConfig:
     only_validation_split: bool
     few_shot: bool
     num_iterations: int
+    max_concurrency: int
     run_with_cli: bool
 
 
@@ -170,7 +170,6 @@ def generate(
                         "CUDA out of memory",
                         "CUDA error",
                         "MPS backend out of memory",
-                        "Too many parallel completions requested.",  # OpenAI specific
                     ]
                     if isinstance(model, VLLMModel) or all(
                         error not in str(e) for error in oom_error
@@ -268,9 +267,8 @@ def generate_single_iteration(
             ]
         )
 
-        if isinstance(model, OpenAIModel):
-            batch_size = 1
-        elif isinstance(model, VLLMModel):
+        # The OpenAI and vLLM models handle the batching themselves
+        if isinstance(model, (OpenAIModel, VLLMModel)):
             batch_size = len(torch_dataset)
         else:
             batch_size = benchmark_config.batch_size
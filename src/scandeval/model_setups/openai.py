@@ -76,6 +76,9 @@ class OpenAIModelSetup:
     Attributes:
         benchmark_config:
             The benchmark configuration.
+        client:
+            The OpenAI client used to list the available models, or None if it has
+            not been initialised yet.
     """
 
     def __init__(self, benchmark_config: "BenchmarkConfig") -> None:
@@ -86,6 +89,7 @@ class OpenAIModelSetup:
                 The benchmark configuration.
         """
         self.benchmark_config = benchmark_config
+        self.client: "openai.OpenAI | None" = None
 
     def model_exists(self, model_id: str) -> bool | dict[str, str]:
         """Check if a model ID denotes an OpenAI model.
@@ -107,9 +111,16 @@ class OpenAIModelSetup:
         if self.benchmark_config.azure_openai_api_key is not None:
             return True
 
+        # We use our own client rather than the module-level one, as the latter does
+        # not use the API key from the benchmark configuration, and we keep the client
+        # to reuse its connections when checking multiple models
         all_models: list[openai.models.Model] = list()
         try:
-            all_models = list(openai.models.list())
+            if self.client is None:
+                self.client = openai.OpenAI(
+                    api_key=self.benchmark_config.openai_api_key
+                )
+            all_models = list(self.client.models.list())
         except openai.OpenAIError as e:
             model_exists = any(
                 [
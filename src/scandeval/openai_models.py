@@ -1,13 +1,21 @@
 """Model and tokenizer wrapper for OpenAI models."""
 
+import asyncio
 import importlib.util
 import logging
-from typing import TYPE_CHECKING, Literal
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Coroutine, Literal, TypeVar
 from openai.types.chat.completion_create_params import ResponseFormat
 
 import torch
 from torch import LongTensor
-from torch.nn.utils.rnn import pad_sequence
+from tqdm.auto import tqdm
 from transformers import BatchEncoding, GenerationConfig
 from transformers.modeling_utils import ModelOutput
 
@@ -24,11 +32,51 @@ if importlib.util.find_spec("tiktoken") is not None:
     import tiktoken
 
 if importlib.util.find_spec("openai") is not None:
-    from openai import AzureOpenAI, NotFoundError, OpenAI, BadRequestError
+    import httpx
+    from openai import (
+        APIConnectionError,
+        APIError,
+        AsyncAzureOpenAI,
+        AsyncOpenAI,
+        AzureOpenAI,
+        BadRequestError,
+        InternalServerError,
+        NotFoundError,
+        OpenAI,
+        RateLimitError,
+    )
+
+if importlib.util.find_spec("httpx_aiohttp") is not None:
+    from httpx_aiohttp import HttpxAiohttpClient
 
 logger = logging.getLogger(__package__)
 
 
+T = TypeVar("T")
+
+
+# The maximum number of attempts made for each generation request, and the maximum
+# number of seconds to wait between two attempts
+MAX_API_ATTEMPTS = 10
+MAX_RETRY_DELAY = 60.0
+
+
+# Patterns of OpenAI model IDs which are known to be chat models, saving us from having
+# to probe the API to figure that out
+CHAT_MODEL_ID_PATTERNS: list[str] = [
+    r"gpt-3\.5-turbo(?!-instruct)",
+    r"gpt-4",
+    r"chatgpt",
+    r"o[1-9](-|$)",
+]
+
+
+# The results of probing the API, keyed by model ID. We cache these since a new model
+# is initialised for every dataset, and each probe costs an API call
+IS_CHAT_MODEL_CACHE: dict[str, bool] = dict()
+SUPPORTS_JSON_MODE_CACHE: dict[str, bool] = dict()
+
+
 class OpenAITokenizer:
     """An OpenAI tokenizer.
 
@@ -68,21 +116,37 @@ class OpenAITokenizer:
         self.sep_token_id: int = self.eos_token_id
         self.pad_token_id: int = self.hf_model_config.pad_token_id or -1
 
-        self.bos_token = self.encoding.decode([self.bos_token_id])
+        self.bos_token = self._decode_special_token(token_id=self.bos_token_id)
         self.cls_token = self.bos_token
-        self.eos_token = self.encoding.decode([self.eos_token_id])
+        self.eos_token = self._decode_special_token(token_id=self.eos_token_id)
         self.sep_token = self.eos_token
 
+        # The special tokens that are allowed to appear in the texts. The CLS and SEP
+        # tokens are the same as the BOS and EOS tokens, so these are not included
+        self._allowed_special = frozenset(
+            {self.bos_token, self.eos_token, self.pad_token}
+        )
+
+    def _decode_special_token(self, token_id: int) -> str:
+        """Decode a special token ID.
+
+        Args:
+            token_id:
+                The token ID to decode, where a negative value means that the model
+                does not have the special token.
+
+        Returns:
+            The decoded special token, or an empty string if the model does not have
+            the special token.
+        """
+        if token_id < 0:
+            return ""
+        return self.encoding.decode([token_id])
+
     @property
     def encoding(self) -> "tiktoken.Encoding":
         """Return the underlying tiktoken encoding."""
-        try:
-            return tiktoken.encoding_for_model(model_name=self.model_config.model_id)
-        except KeyError:
-            # For Azure, the model_id is the deployment name. I do not know how to
-            # dynamically get the currently deployed model so assuming Azure only
-            # supports the latest models.
-            return tiktoken.get_encoding("cl100k_base")
+        return get_encoding(model_id=self.model_config.model_id)
 
     def __call__(self, text: str | list[str], **kwargs) -> BatchEncoding:
         """Tokenize text.
@@ -99,25 +163,29 @@ class OpenAITokenizer:
         truncation = kwargs.get("truncation", False)
         start_idx = -self.model_max_length if truncation else 0
 
-        text_list = [text] if isinstance(text, str) else text
-        encoded_inputs = [
-            BatchEncoding(
-                dict(
-                    input_ids=self.encoding.encode(
-                        text,
-                        allowed_special={
-                            self.bos_token,
-                            self.eos_token,
-                            self.cls_token,
-                            self.sep_token,
-                            self.pad_token,
-                        },
-                    )[start_idx:]
-                )
+        # A single text does not need any padding, so we return it directly
+        if isinstance(text, str):
+            token_ids = self.encoding.encode(
+                text, allowed_special=self._allowed_special
             )
-            for text in text_list
+            input_ids = torch.as_tensor([token_ids[start_idx:]], dtype=torch.long)
+            return BatchEncoding(dict(input_ids=input_ids))
+
+        # We encode all the texts at once, as `encode_batch` encodes the texts in
+        # parallel, releasing the GIL while doing so. There is no need to start more
+        # threads than there are texts
+        num_threads = max(1, min(len(text), os.cpu_count() or 1))
+        token_id_lists = self.encoding.encode_batch(
+            text, num_threads=num_threads, allowed_special=self._allowed_special
+        )
+        encoded_inputs = [
+            BatchEncoding(dict(input_ids=token_ids[start_idx:]))
+            for token_ids in token_id_lists
         ]
-        return self.pad(encoded_inputs=encoded_inputs)
+        return self.pad(
+            encoded_inputs=encoded_inputs,
+            pad_to_multiple_of=kwargs.get("pad_to_multiple_of"),
+        )
 
     def decode(self, token_ids: list[int], **kwargs) -> str:
         """Decode token IDs.
@@ -245,6 +313,7 @@ class OpenAITokenizer:
             | dict[str, list[list[int]]]
             | list[dict[str, list[int]]]
         ),
+        pad_to_multiple_of: int | None = None,
         **kwargs,
     ) -> BatchEncoding:
         """Pad encoded inputs.
@@ -256,9 +325,26 @@ class OpenAITokenizer:
                 Dict[str, List[List[int]]] or List[Dict[str, List[int]]]) so you can
                 use this method during preprocessing as well as in a PyTorch Dataloader
                 collate function.
+            pad_to_multiple_of:
+                If set, the sequences will be padded to a multiple of this value. If
+                None then the sequences are padded to the longest sequence in the
+                batch. Defaults to None.
             **kwargs:
                 Additional keyword arguments.
+
+        Returns:
+            The padded inputs.
+
+        Raises:
+            ValueError:
+                If `pad_to_multiple_of` is not a positive integer.
         """
+        if pad_to_multiple_of is not None and pad_to_multiple_of < 1:
+            raise ValueError(
+                "The `pad_to_multiple_of` argument must be a positive integer, but it "
+                f"was {pad_to_multiple_of}."
+            )
+
         # Single example
         if isinstance(encoded_inputs, BatchEncoding):
             return encoded_inputs
@@ -276,22 +362,21 @@ class OpenAITokenizer:
             assert isinstance(encoded_inputs, list)
             input_ids = [list(example["input_ids"]) for example in encoded_inputs]
 
-        # Flip the token IDs in the lists, since `pad_sequence` pads to the right by
-        # default, and we want padding to the left
-        flipped_input_ids: list["Tensor"] = []
-        for input_id_list in input_ids:
-            input_id_list.reverse()
-            flipped_input_ids.append(LongTensor(input_id_list))
-
-        padded_input_ids = (
-            pad_sequence(
-                sequences=flipped_input_ids,
-                batch_first=True,
-                padding_value=self.pad_token_id,
-            )
-            .flip(dims=[1])
-            .long()
+        # We allocate the padded tensor up front and copy the token IDs into it, with
+        # the padding being to the left
+        lengths = [len(input_id_list) for input_id_list in input_ids]
+        max_length = max(lengths, default=0)
+        if pad_to_multiple_of is not None:
+            max_length = -(-max_length // pad_to_multiple_of) * pad_to_multiple_of
+        padded_input_ids = torch.full(
+            size=(len(input_ids), max_length),
+            fill_value=self.pad_token_id,
+            dtype=torch.long,
         )
+        for idx, (input_id_list, length) in enumerate(zip(input_ids, lengths)):
+            padded_input_ids[idx, max_length - length :] = torch.as_tensor(
+                input_id_list, dtype=torch.long
+            )
 
         return BatchEncoding(dict(input_ids=padded_input_ids))
 
@@ -322,6 +407,12 @@ class OpenAIModel:
             The tokenizer.
         device:
             The device to use, is always CPU.
+        client:
+            The synchronous OpenAI client, used for probing the model.
+        async_client:
+            The asynchronous OpenAI client, used for generation.
+        rate_limiter:
+            The rate limiter used to stay within the rate limits of the API.
         is_chat_model:
             Whether the model is a chat model.
     """
@@ -356,6 +447,13 @@ class OpenAIModel:
         self.tokenizer = tokenizer
         self.device = torch.device("cpu")
         self.client = self._initialize_openai_client()
+        self.async_client = self._initialize_async_openai_client()
+
+        # We use a dedicated event loop, rather than `asyncio.run`, as the connections
+        # in the client's connection pool are bound to the event loop that created
+        # them, and we want to reuse these across calls to `generate`
+        self._event_loop = asyncio.new_event_loop()
+        self.rate_limiter = RateLimiter()
         self.is_chat_model = self._is_chat_model()
         self.supports_json_mode = self._supports_json_mode()
 
@@ -415,39 +513,118 @@ class OpenAIModel:
                 "`AZURE_OPENAI_API_KEY` and `AZURE_OPENAI_ENDPOINT`)."
             )
 
+    def _initialize_async_openai_client(self) -> AsyncOpenAI | AsyncAzureOpenAI:
+        """Initialize and return the asynchronous OpenAI client.
+
+        This assumes that the synchronous client has already been initialised, so that
+        the API credentials have been validated. The client does not retry failed
+        requests itself, as this is handled in `_generate_single`.
+
+        Returns:
+            The asynchronous OpenAI client.
+        """
+        # The connection pool has to be at least as large as the number of concurrent
+        # requests, as otherwise the requests will wait for a free connection
+        max_concurrency = self.benchmark_config.max_concurrency
+        limits = httpx.Limits(
+            max_connections=max(2 * max_concurrency, 200),
+            max_keepalive_connections=max_concurrency,
+        )
+
+        # The aiohttp transport scales a lot better with the number of concurrent
+        # requests than the default httpx transport, so we use that if it is installed
+        http_client: httpx.AsyncClient
+        if importlib.util.find_spec("httpx_aiohttp") is not None:
+            http_client = HttpxAiohttpClient(limits=limits)
+        else:
+            http_client = httpx.AsyncClient(limits=limits)
+
+        if self.benchmark_config.openai_api_key is not None:
+            return AsyncOpenAI(
+                api_key=self.benchmark_config.openai_api_key,
+                max_retries=0,
+                http_client=http_client,
+            )
+        return AsyncAzureOpenAI(
+            api_key=self.benchmark_config.azure_openai_api_key,
+            azure_endpoint=self.benchmark_config.azure_openai_endpoint,
+            api_version=self.benchmark_config.azure_openai_api_version,
+            max_retries=0,
+            http_client=http_client,
+        )
+
+    def __del__(self) -> None:
+        """Close the asynchronous client along with its event loop."""
+        event_loop = getattr(self, "_event_loop", None)
+        if event_loop is None or event_loop.is_closed():
+            return
+        try:
+            if hasattr(self, "async_client"):
+                coroutine = self.async_client.close()
+                try:
+                    self._run_coroutine(coroutine=coroutine)
+                except RuntimeError:
+                    # The coroutine cannot be run during interpreter shutdown, in which
+                    # case we close it to avoid a warning about it never being awaited
+                    coroutine.close()
+        finally:
+            event_loop.close()
+
     def _is_chat_model(self) -> bool:
         """Returns whether the model is a chat model."""
+        model_id = self.model_config.model_id
+        if model_id in IS_CHAT_MODEL_CACHE:
+            return IS_CHAT_MODEL_CACHE[model_id]
+
+        # For Azure, the model ID is the deployment name, so we can only use the known
+        # model ID patterns with the OpenAI API
+        if self.benchmark_config.openai_api_key is not None and any(
+            re.match(pattern=pattern, string=model_id) is not None
+            for pattern in CHAT_MODEL_ID_PATTERNS
+        ):
+            IS_CHAT_MODEL_CACHE[model_id] = True
+            return True
+
         try:
-            self.client.completions.create(
-                model=self.model_config.model_id, prompt="Test", max_tokens=1
-            )
-            return False
+            self.client.completions.create(model=model_id, prompt="Test", max_tokens=1)
+            is_chat_model = False
         except (NotFoundError, BadRequestError) as e:
             chat_model_strings = [
                 "This is a chat model",
                 "The completion operation does not work with the specified model",
             ]
-            if any(string in str(e) for string in chat_model_strings):
-                return True
-            raise e
+            if not any(string in str(e) for string in chat_model_strings):
+                raise e
+            is_chat_model = True
+
+        IS_CHAT_MODEL_CACHE[model_id] = is_chat_model
+        return is_chat_model
 
     def _supports_json_mode(self) -> bool:
         """Returns whether the model supports JSON mode."""
         if not self.is_chat_model:
             return False
+
+        model_id = self.model_config.model_id
+        if model_id in SUPPORTS_JSON_MODE_CACHE:
+            return SUPPORTS_JSON_MODE_CACHE[model_id]
+
         try:
             self.client.chat.completions.create(
-                model=self.model_config.model_id,
+                model=model_id,
                 messages=[dict(role="user", content="Test json")],
                 max_tokens=1,
                 response_format=ResponseFormat(type="json_object"),
             )
-            return True
+            supports_json_mode = True
         except BadRequestError as e:
             no_json_mode_strings = ["not supported with this model"]
-            if any(string in str(e) for string in no_json_mode_strings):
-                return False
-            raise e
+            if not any(string in str(e) for string in no_json_mode_strings):
+                raise e
+            supports_json_mode = False
+
+        SUPPORTS_JSON_MODE_CACHE[model_id] = supports_json_mode
+        return supports_json_mode
 
     def generate(
         self,
@@ -468,7 +645,11 @@ class OpenAIModel:
                 generation configuration.
 
         Returns:
-            The model output.
+            The model output. The completions are returned as a left-padded tensor of
+            shape (batch_size, max_completion_length), as the generation pipeline
+            expects dense sequences, just like those of the other generative models.
+            Only the completions are padded, and they are at most `max_new_tokens`
+            long, so the padding is small.
         """
         if generation_config is None:
             generation_config = GenerationConfig(**generation_kwargs)
@@ -476,23 +657,38 @@ class OpenAIModel:
             for key, value in generation_kwargs.items():
                 setattr(generation_config, key, value)
 
-        multiple_inputs = inputs.size(dim=0) > 1
-        if multiple_inputs:
-            raise ValueError(
-                "OpenAI models do not support multiple inputs. Please use a batch "
-                "size of 1."
-            )
+        # A single input is treated as a batch of size one, so that both cases follow
+        # the same code path
+        if inputs.dim() == 1:
+            inputs = inputs.unsqueeze(0)
+
+        # Empty inputs do not require any API calls, so we return empty completions
+        if inputs.numel() == 0:
+            output = torch.empty((inputs.size(0), 0), dtype=torch.long)
+            if generation_config.return_dict_in_generate:
+                return ModelOutput(dict(sequences=output))
+            return output
+
+        # Remove the padding, where we mask the rows in PyTorch rather than iterating
+        # over the individual token IDs in Python
+        input_id_lists = [
+            input_ids[input_ids != self.config.pad_token_id].tolist()
+            for input_ids in inputs
+        ]
 
-        two_dimensional_input = len(inputs.size()) == 2
-        if two_dimensional_input:
-            inputs = inputs[0]
+        # We send the longest prompts first, as these take the longest to complete,
+        # which reduces the time spent waiting for the last few completions
+        order = sorted(
+            range(len(input_id_lists)),
+            key=lambda idx: len(input_id_lists[idx]),
+            reverse=True,
+        )
 
-        prompt = self.tokenizer.decode(
-            [
-                token_id
-                for token_id in inputs.tolist()
-                if token_id != self.config.pad_token_id
-            ]
+        # The padding has already been removed, so we decode the prompts directly with
+        # the encoding, rather than with the tokenizer which removes padding again
+        prompts = self.tokenizer.encoding.decode_batch(
+            [input_id_lists[idx] for idx in order],
+            num_threads=max(1, min(len(order), os.cpu_count() or 1)),
         )
 
         model_id = self.model_config.model_id
@@ -507,9 +703,129 @@ class OpenAIModel:
             top_p=generation_config.top_p,
             n=generation_config.num_return_sequences,
             frequency_penalty=generation_config.repetition_penalty - 1.0,
-            stop=["\n\n", self.tokenizer.eos_token, self.tokenizer.pad_token],
+            stop=[
+                stop_string
+                for stop_string in [
+                    "\n\n",
+                    self.tokenizer.eos_token,
+                    self.tokenizer.pad_token,
+                ]
+                if stop_string
+            ],
+        )
+
+        # The maximum number of tokens counts towards the rate limit, along with the
+        # tokens in the prompt
+        num_tokens = [len(input_id_lists[idx]) + max_tokens for idx in order]
+
+        sorted_generation_outputs = self._run_coroutine(
+            coroutine=self._generate_all(
+                prompts=prompts, num_tokens=num_tokens, **generation_kwargs
+            )
         )
 
+        # Restore the original order of the inputs
+        generation_outputs = [""] * len(order)
+        for idx, generation_output in zip(order, sorted_generation_outputs):
+            generation_outputs[idx] = generation_output
+
+        # The completions are tokenized in a single batch after all of them have been
+        # generated, to avoid blocking the event loop
+        output = self.tokenizer(generation_outputs).input_ids
+
+        if generation_config.return_dict_in_generate:
+            output = ModelOutput(dict(sequences=output))
+
+        return output
+
+    def _run_coroutine(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion in the model's event loop.
+
+        Args:
+            coroutine:
+                The coroutine to run.
+
+        Returns:
+            The result of the coroutine.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._event_loop.run_until_complete(coroutine)
+
+        # If an event loop is already running in this thread, which is for instance the
+        # case in Jupyter notebooks, then we cannot run our own event loop in it, so we
+        # run it in a separate thread instead
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                self._event_loop.run_until_complete, coroutine
+            ).result()
+
+    async def _generate_all(
+        self, prompts: list[str], num_tokens: list[int], **generation_kwargs
+    ) -> list[str]:
+        """Generate completions for all the prompts concurrently.
+
+        Args:
+            prompts:
+                The prompts to generate completions for.
+            num_tokens:
+                The number of tokens that each request counts towards the rate limit.
+            **generation_kwargs:
+                Keyword arguments to pass to the OpenAI API.
+
+        Returns:
+            The completions, in the same order as the prompts.
+        """
+        semaphore = asyncio.Semaphore(self.benchmark_config.max_concurrency)
+        input_is_a_test = len(prompts) == 1
+        with tqdm(
+            total=len(prompts),
+            leave=False,
+            disable=input_is_a_test or hasattr(sys, "_called_from_test"),
+        ) as pbar:
+
+            async def generate_single(prompt: str, num_tokens: int) -> str:
+                async with semaphore:
+                    generation_output = await self._generate_single(
+                        prompt=prompt, num_tokens=num_tokens, **generation_kwargs
+                    )
+                pbar.update(1)
+                return generation_output
+
+            tasks = [
+                asyncio.create_task(
+                    generate_single(prompt=prompt, num_tokens=prompt_num_tokens)
+                )
+                for prompt, prompt_num_tokens in zip(prompts, num_tokens)
+            ]
+
+            # The retries are handled for each request separately, so if a request
+            # still fails then there is no point in waiting for the remaining ones
+            try:
+                return await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+    async def _generate_single(
+        self, prompt: str, num_tokens: int, **generation_kwargs
+    ) -> str:
+        """Generate a completion for a single prompt.
+
+        Args:
+            prompt:
+                The prompt to generate a completion for.
+            num_tokens:
+                The number of tokens that the request counts towards the rate limit.
+            **generation_kwargs:
+                Keyword arguments to pass to the OpenAI API.
+
+        Returns:
+            The completion.
+        """
         if (
             self.dataset_config.task == NER
             and self.supports_json_mode
@@ -517,29 +833,248 @@ class OpenAIModel:
         ):
             generation_kwargs["response_format"] = dict(type="json_object")
 
-        try:
-            if not self.is_chat_model:
-                model_output = self.client.completions.create(
+        error: APIError | None = None
+        for attempt in range(MAX_API_ATTEMPTS):
+            try:
+                await self.rate_limiter.acquire(num_tokens=num_tokens)
+                return await self._request_completion(
+                    prompt=prompt, **generation_kwargs
+                )
+            except BadRequestError as e:
+                logger.debug(
+                    "Encountered error during OpenAI generation - returning blank "
+                    f"string instead. The error thrown was {str(e)!r}, and the prompt "
+                    f"causing it was {prompt!r}."
+                )
+                return " "
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                error = e
+                if isinstance(e, RateLimitError):
+                    self.rate_limiter.update(headers=e.response.headers)
+                if attempt == MAX_API_ATTEMPTS - 1:
+                    break
+                retry_delay = get_retry_delay(error=e, attempt=attempt)
+                logger.debug(
+                    f"Encountered {type(e).__name__} during OpenAI generation, on "
+                    f"attempt {attempt + 1}/{MAX_API_ATTEMPTS}. Retrying in "
+                    f"{retry_delay:.2f} seconds. The error thrown was {str(e)!r}."
+                )
+                await asyncio.sleep(retry_delay)
+
+        raise InvalidBenchmark(
+            f"Could not generate a completion with the OpenAI model after "
+            f"{MAX_API_ATTEMPTS} attempts. The last error thrown was {str(error)!r}."
+        ) from error
+
+    async def _request_completion(self, prompt: str, **generation_kwargs) -> str:
+        """Request a completion for a single prompt from the OpenAI API.
+
+        Args:
+            prompt:
+                The prompt to generate a completion for.
+            **generation_kwargs:
+                Keyword arguments to pass to the OpenAI API.
+
+        Returns:
+            The completion.
+        """
+        # We use the raw responses to get access to the rate limit headers
+        if not self.is_chat_model:
+            raw_completion = (
+                await self.async_client.completions.with_raw_response.create(
                     prompt=prompt, **generation_kwargs
                 )
-                generation_output = model_output.choices[0].text.strip()
-            else:
-                model_output = self.client.chat.completions.create(
+            )
+            self.rate_limiter.update(headers=raw_completion.headers)
+            return raw_completion.parse().choices[0].text.strip()
+        else:
+            raw_chat_completion = (
+                await self.async_client.chat.completions.with_raw_response.create(
                     messages=[dict(role="user", content=prompt)], **generation_kwargs
                 )
-                generation_output = model_output.choices[0].message.content.strip()
-        except BadRequestError as e:
-            logger.debug(
-                "Encountered error during OpenAI generation - returning blank string "
-                f"instead. The error thrown was {str(e)!r}, and the prompt causing "
-                f"it was {prompt!r}."
             )
-            generation_output = " "
+            self.rate_limiter.update(headers=raw_chat_completion.headers)
+            return raw_chat_completion.parse().choices[0].message.content.strip()
 
-        completion_ids = self.tokenizer([generation_output]).input_ids.tolist()
-        output = LongTensor(completion_ids)
 
-        if generation_config.return_dict_in_generate:
-            output = ModelOutput(dict(sequences=output))
+class RateLimiter:
+    """Rate limiter for the OpenAI API, based on the rate limit headers it returns.
 
-        return output
+    Each request reserves its tokens before it is sent, and if the remaining requests or
+    tokens in the current rate limit window do not suffice, then we wait until the
+    window resets, for at most `MAX_RETRY_DELAY` seconds. The remaining requests and
+    tokens are updated from the `x-ratelimit-*` headers of each response.
+
+    Attributes:
+        remaining_requests:
+            The number of requests remaining in the current window, or None if unknown.
+        remaining_tokens:
+            The number of tokens remaining in the current window, or None if unknown.
+        requests_reset_time:
+            The time, as given by `time.monotonic`, at which the request limit resets.
+        tokens_reset_time:
+            The time, as given by `time.monotonic`, at which the token limit resets.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the rate limiter."""
+        self.remaining_requests: int | None = None
+        self.remaining_tokens: int | None = None
+        self.requests_reset_time: float = 0.0
+        self.tokens_reset_time: float = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, num_tokens: int) -> None:
+        """Wait until a request with the given number of tokens can be sent.
+
+        Args:
+            num_tokens:
+                The number of tokens that the request counts towards the rate limit.
+        """
+        # We hold the lock while waiting, as all other requests have to wait for the
+        # window to reset as well. The reset times can be several minutes away, while
+        # the limits are usually replenished gradually, so we wait at most
+        # `MAX_RETRY_DELAY` seconds and let the API tell us if we are still limited
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self.remaining_requests is not None
+                and self.remaining_requests < 1
+                and now < self.requests_reset_time
+            ):
+                await asyncio.sleep(
+                    min(self.requests_reset_time - now, MAX_RETRY_DELAY)
+                )
+                self.remaining_requests = None
+
+            now = time.monotonic()
+            if (
+                self.remaining_tokens is not None
+                and self.remaining_tokens < num_tokens
+                and now < self.tokens_reset_time
+            ):
+                await asyncio.sleep(min(self.tokens_reset_time - now, MAX_RETRY_DELAY))
+                self.remaining_tokens = None
+
+            if self.remaining_requests is not None:
+                self.remaining_requests -= 1
+            if self.remaining_tokens is not None:
+                self.remaining_tokens -= num_tokens
+
+    def update(self, headers: "httpx.Headers") -> None:
+        """Update the rate limits from the headers of an API response.
+
+        Args:
+            headers:
+                The headers of the API response.
+        """
+        now = time.monotonic()
+        try:
+            if "x-ratelimit-remaining-requests" in headers:
+                self.remaining_requests = int(headers["x-ratelimit-remaining-requests"])
+            if "x-ratelimit-remaining-tokens" in headers:
+                self.remaining_tokens = int(headers["x-ratelimit-remaining-tokens"])
+            if "x-ratelimit-reset-requests" in headers:
+                self.requests_reset_time = now + parse_duration(
+                    duration=headers["x-ratelimit-reset-requests"]
+                )
+            if "x-ratelimit-reset-tokens" in headers:
+                self.tokens_reset_time = now + parse_duration(
+                    duration=headers["x-ratelimit-reset-tokens"]
+                )
+        except ValueError:
+            logger.debug(f"Could not parse the rate limit headers {dict(headers)}.")
+
+
+@lru_cache(maxsize=16)
+def get_encoding(model_id: str) -> "tiktoken.Encoding":
+    """Get the tiktoken encoding for a model.
+
+    The encodings are cached, as loading the BPE ranks is slow and the same model is
+    used for many datasets in a benchmark.
+
+    Args:
+        model_id:
+            The model ID.
+
+    Returns:
+        The tiktoken encoding.
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name=model_id)
+    except KeyError:
+        # For Azure, the model_id is the deployment name. I do not know how to
+        # dynamically get the currently deployed model so assuming Azure only
+        # supports the latest models.
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def parse_duration(duration: str) -> float:
+    """Parse a duration from the OpenAI rate limit headers.
+
+    Args:
+        duration:
+            The duration, such as "20ms", "1.5s" or "6m0s".
+
+    Returns:
+        The duration in seconds.
+
+    Raises:
+        ValueError:
+            If the duration could not be parsed.
+    """
+    units = dict(h=3600.0, m=60.0, s=1.0, ms=0.001)
+    parts = re.findall(pattern=r"([0-9.]+)(ms|h|m|s)", string=duration)
+    if not parts or "".join(value + unit for value, unit in parts) != duration:
+        raise ValueError(f"Could not parse the duration {duration!r}.")
+    return sum(float(value) * units[unit] for value, unit in parts)
+
+
+def get_retry_delay(error: "APIError", attempt: int) -> float:
+    """Get the number of seconds to wait before retrying a failed request.
+
+    The delay suggested by the API is used if it is available, either through the
+    `Retry-After` headers or through the error message. Otherwise we use exponential
+    backoff with jitter.
+
+    Args:
+        error:
+            The error raised by the failed request.
+        attempt:
+            The (zero-indexed) number of the attempt that failed.
+
+    Returns:
+        The number of seconds to wait.
+    """
+    response: "httpx.Response | None" = getattr(error, "response", None)
+    if response is not None:
+        retry_after_ms = response.headers.get("retry-after-ms")
+        retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after_ms is not None:
+                return min(float(retry_after_ms) / 1000, MAX_RETRY_DELAY)
+            elif retry_after is not None:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+
+    # The OpenAI API states durations such as "Please try again in 120ms" or "Please try
+    # again in 6m0s", and the Azure OpenAI API states "Please retry after 20 seconds"
+    error_message = str(error)
+    duration_match = re.search(
+        pattern=r"try again in ((?:[0-9.]+(?:ms|h|m|s))+)\b", string=error_message
+    )
+    seconds_match = re.search(
+        pattern=r"(?:try again in|retry after) ([0-9.]+) ?(?:sec|seconds?)\b",
+        string=error_message,
+    )
+    try:
+        if duration_match is not None:
+            delay = parse_duration(duration=duration_match.group(1))
+            return min(delay, MAX_RETRY_DELAY)
+        elif seconds_match is not None:
+            return min(float(seconds_match.group(1)), MAX_RETRY_DELAY)
+    except ValueError:
+        pass
+
+    return min(2**attempt + random.random(), MAX_RETRY_DELAY)
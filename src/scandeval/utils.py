@@ -22,6 +22,7 @@ import torch
 from datasets.utils import disable_progress_bar
 from huggingface_hub import HfApi, ModelFilter
 from requests.exceptions import RequestException
+from termcolor import colored
 from transformers import GenerationConfig
 from transformers import logging as tf_logging
 
@@ -202,6 +203,35 @@ def block_terminal_output():
     logging.getLogger("transformers.trainer").setLevel(logging.CRITICAL)
 
 
+def configure_runtime_environment() -> None:
+    """Sets the environment variables used when benchmarking, unless already set."""
+    # Disable parallelisation when tokenizing, as that can lead to errors
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    # Enable MPS fallback
+    os.environ.setdefault("PYTORCH_ENABLE_MPS_FALLBACK", "1")
+
+    # Set amount of threads per GPU - this is the default and is only set to prevent a
+    # warning from showing
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+
+def configure_logging() -> None:
+    """Sets up a formatted handler for the ScandEval logger."""
+    # If the root logger has already been configured then we leave the logging to that,
+    # as the messages would otherwise be logged twice
+    if logging.getLogger().handlers or any(
+        isinstance(handler, logging.StreamHandler) for handler in logger.handlers
+    ):
+        return
+
+    fmt = colored("%(asctime)s", "light_blue") + " ⋅ " + colored("%(message)s", "green")
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt=fmt, datefmt="%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
 def get_class_by_name(
     class_name: str | list[str], module_name: str | None = None
 ) -> Type | None:
@@ -81,6 +81,7 @@ def benchmark_config(
         only_validation_split=False,
         few_shot=True,
         num_iterations=10,
+        max_concurrency=32,
         run_with_cli=True,
     )
 
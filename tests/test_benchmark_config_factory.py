@@ -5,6 +5,7 @@ from typing import Generator
 import pytest
 import torch
 from scandeval.benchmark_config_factory import (
+    build_benchmark_config,
     get_correct_language_codes,
     prepare_device,
     prepare_languages,
@@ -222,3 +223,41 @@ def test_prepare_device(device, expected_device):
     """Test the output of `prepare_device`."""
     prepared_device = prepare_device(device=device)
     assert prepared_device == expected_device
+
+
+@pytest.mark.parametrize(argnames=["max_concurrency"], argvalues=[(0,), (-1,)])
+def test_build_benchmark_config_invalid_max_concurrency(max_concurrency):
+    """Test that a maximum number of concurrent requests below 1 raises an error."""
+    with pytest.raises(InvalidBenchmark):
+        build_benchmark_config(
+            progress_bar=False,
+            save_results=False,
+            task=None,
+            dataset=None,
+            language="da",
+            model_language=None,
+            dataset_language=None,
+            framework=None,
+            device=None,
+            batch_size=32,
+            evaluate_train=False,
+            raise_errors=False,
+            cache_dir=".scandeval_cache",
+            token=None,
+            openai_api_key=None,
+            prefer_azure=False,
+            azure_openai_api_key=None,
+            azure_openai_endpoint=None,
+            azure_openai_api_version=None,
+            force=False,
+            verbose=False,
+            trust_remote_code=False,
+            load_in_4bit=None,
+            use_flash_attention=False,
+            clear_model_cache=False,
+            only_validation_split=False,
+            few_shot=True,
+            num_iterations=1,
+            max_concurrency=max_concurrency,
+            run_with_cli=False,
+        )
@@ -3,7 +3,7 @@
 from typing import Generator
 
 import pytest
-from click import INT, ParamType
+from click import INT, IntRange, ParamType
 from click.types import BOOL, STRING, Choice
 from scandeval.cli import benchmark
 
@@ -48,6 +48,7 @@ def test_cli_param_names(params):
         "only_validation_split",
         "few_shot",
         "num_iterations",
+        "max_concurrency",
         "help",
     }
 
@@ -84,4 +85,6 @@ def test_cli_param_types(params):
     assert params["only_validation_split"] == BOOL
     assert params["few_shot"] == BOOL
     assert params["num_iterations"] == INT
+    assert isinstance(params["max_concurrency"], IntRange)
+    assert params["max_concurrency"].min == 1
     assert params["help"] == BOOL
@@ -1 +1,666 @@
 """Unit tests for the `openai_models` module."""
+
+import asyncio
+from copy import copy
+from dataclasses import replace
+from types import SimpleNamespace
+from typing import Generator
+
+import httpx
+import pytest
+import torch
+from openai import APIConnectionError, BadRequestError, NotFoundError, RateLimitError
+from scandeval import openai_models
+from scandeval.config import BenchmarkConfig
+from scandeval.exceptions import InvalidBenchmark
+from scandeval.openai_models import (
+    MAX_API_ATTEMPTS,
+    MAX_RETRY_DELAY,
+    OpenAIModel,
+    OpenAITokenizer,
+    RateLimiter,
+    get_retry_delay,
+    parse_duration,
+)
+from transformers import PretrainedConfig
+from transformers.modeling_utils import ModelOutput
+
+# The padding token ID used in the tests, which lies outside the character codes used
+PAD_TOKEN_ID = 1000
+
+
+class FakeEncoding:
+    """Dummy tiktoken encoding for testing, which encodes each character separately."""
+
+    max_token_value = PAD_TOKEN_ID
+
+    def encode(self, text: str, **kwargs) -> list[int]:
+        """Encode a text."""
+        return [ord(character) for character in text]
+
+    def encode_batch(self, texts: list[str], **kwargs) -> list[list[int]]:
+        """Encode a batch of texts."""
+        return [self.encode(text=text) for text in texts]
+
+    def decode(self, tokens: list[int]) -> str:
+        """Decode a list of token IDs."""
+        return "".join(chr(token) for token in tokens)
+
+    def decode_batch(self, batch: list[list[int]], **kwargs) -> list[str]:
+        """Decode a batch of token ID lists."""
+        return [self.decode(tokens=tokens) for tokens in batch]
+
+
+@pytest.fixture
+def hf_model_config() -> Generator[PretrainedConfig, None, None]:
+    """Yields a Hugging Face model configuration without BOS and EOS tokens."""
+    yield PretrainedConfig(pad_token_id=PAD_TOKEN_ID, model_max_length=100)
+
+
+@pytest.fixture
+def tokenizer(
+    model_config, hf_model_config, monkeypatch
+) -> Generator[OpenAITokenizer, None, None]:
+    """Yields an OpenAI tokenizer, which does not need to download any encoding."""
+    monkeypatch.setattr(openai_models, "get_encoding", lambda model_id: FakeEncoding())
+    yield OpenAITokenizer(model_config=model_config, hf_model_config=hf_model_config)
+
+
+@pytest.fixture
+def openai_model(
+    model_config, hf_model_config, dataset_config, benchmark_config, tokenizer
+) -> Generator[OpenAIModel, None, None]:
+    """Yields an OpenAI model which does not send any requests to the API.
+
+    The completion of a prompt is the prompt in upper case. The prompts are stored in
+    the `prompts` attribute in the order in which they were sent, along with the
+    keyword arguments of each request in the `request_kwargs` attribute.
+    """
+    # We skip the initialisation, as that sets up the API clients and probes the API
+    model = OpenAIModel.__new__(OpenAIModel)
+    model.model_config = model_config
+    model.config = hf_model_config
+    model.dataset_config = dataset_config
+    model.benchmark_config = benchmark_config
+    model.tokenizer = tokenizer
+    model.is_chat_model = True
+    model.supports_json_mode = False
+    model.rate_limiter = RateLimiter()
+    model._event_loop = asyncio.new_event_loop()
+    model.prompts = list()
+    model.request_kwargs = list()
+
+    async def request_completion(prompt: str, **generation_kwargs) -> str:
+        model.prompts.append(prompt)
+        model.request_kwargs.append(generation_kwargs)
+        await asyncio.sleep(0)
+        return prompt.upper()
+
+    model._request_completion = request_completion
+    yield model
+    model._event_loop.close()
+
+
+class FakeAsyncClient:
+    """Dummy asynchronous OpenAI client for testing."""
+
+    closed: bool = False
+
+    async def close(self) -> None:
+        """Close the client."""
+        self.closed = True
+
+
+class FakeOpenAIClient:
+    """Dummy synchronous OpenAI client for testing, which counts the API requests."""
+
+    def __init__(self, is_chat_model: bool) -> None:
+        """Initialise the client.
+
+        Args:
+            is_chat_model:
+                Whether the completions endpoint should reject the model as a chat
+                model.
+        """
+        self.is_chat_model = is_chat_model
+        self.num_requests = 0
+        self.completions = SimpleNamespace(create=self.create_completion)
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self.create_chat_completion)
+        )
+
+    def create_completion(self, **kwargs) -> None:
+        """Create a completion, which fails for chat models."""
+        self.num_requests += 1
+        if self.is_chat_model:
+            request = httpx.Request(
+                method="POST", url="https://api.openai.com/v1/completions"
+            )
+            response = httpx.Response(status_code=404, request=request)
+            raise NotFoundError(
+                message="This is a chat model and not supported in the "
+                "v1/completions endpoint.",
+                response=response,
+                body=None,
+            )
+
+    def create_chat_completion(self, **kwargs) -> None:
+        """Create a chat completion."""
+        self.num_requests += 1
+
+
+def decode_completions(output: torch.Tensor) -> list[str]:
+    """Decode the completions returned by the fake OpenAI model."""
+    return [
+        "".join(chr(token) for token in row if token != PAD_TOKEN_ID)
+        for row in output.tolist()
+    ]
+
+
+def create_rate_limit_error(
+    message: str, headers: dict[str, str] | None = None
+) -> RateLimitError:
+    """Create a rate limit error, as it would be raised by the OpenAI client."""
+    request = httpx.Request(method="POST", url="https://api.openai.com/v1/completions")
+    response = httpx.Response(status_code=429, headers=headers, request=request)
+    return RateLimitError(message=message, response=response, body=None)
+
+
+def create_connection_error() -> APIConnectionError:
+    """Create a connection error, as it would be raised by the OpenAI client."""
+    request = httpx.Request(method="POST", url="https://api.openai.com/v1/completions")
+    return APIConnectionError(request=request)
+
+
+def create_bad_request_error(message: str) -> BadRequestError:
+    """Create a bad request error, as it would be raised by the OpenAI client."""
+    request = httpx.Request(method="POST", url="https://api.openai.com/v1/completions")
+    response = httpx.Response(status_code=400, request=request)
+    return BadRequestError(message=message, response=response, body=None)
+
+
+def fail_requests(model: OpenAIModel, errors: list[Exception]) -> None:
+    """Make the requests of a fake OpenAI model raise the given errors, in order.
+
+    The requests succeed once all the errors have been raised.
+    """
+    remaining_errors = list(errors)
+
+    async def request_completion(prompt: str, **generation_kwargs) -> str:
+        model.prompts.append(prompt)
+        if remaining_errors:
+            raise remaining_errors.pop(0)
+        return prompt.upper()
+
+    model._request_completion = request_completion
+
+
+class TestGetRetryDelay:
+    """Unit tests for the `get_retry_delay` function."""
+
+    @pytest.mark.parametrize(
+        argnames=["headers", "expected"],
+        argvalues=[
+            ({"retry-after": "3"}, 3.0),
+            ({"retry-after-ms": "1500"}, 1.5),
+            ({"retry-after": "3", "retry-after-ms": "250"}, 0.25),
+            ({"retry-after": "1000"}, MAX_RETRY_DELAY),
+        ],
+        ids=["retry-after", "retry-after-ms", "prefer ms", "capped"],
+    )
+    def test_retry_after_headers(self, headers, expected):
+        """Test that the `Retry-After` headers are used."""
+        error = create_rate_limit_error(message="Rate limit", headers=headers)
+        assert get_retry_delay(error=error, attempt=0) == expected
+
+    @pytest.mark.parametrize(
+        argnames=["message", "expected"],
+        argvalues=[
+            ("Rate limit reached. Please try again in 20s.", 20.0),
+            ("Rate limit reached. Please try again in 120ms.", 0.12),
+            ("Rate limit reached. Please try again in 1.5s.", 1.5),
+            ("Rate limit reached. Please try again in 1m41.28s.", MAX_RETRY_DELAY),
+            ("Rate limit reached. Please try again in 6m0s.", MAX_RETRY_DELAY),
+            ("Rate limit reached. Please try again in 0m12.5s.", 12.5),
+            ("Rate limit is exceeded. Please retry after 8 seconds.", 8.0),
+        ],
+        ids=[
+            "openai seconds",
+            "openai milliseconds",
+            "openai float",
+            "openai minutes and seconds",
+            "openai minutes",
+            "openai zero minutes",
+            "azure",
+        ],
+    )
+    def test_delay_in_error_message(self, message, expected):
+        """Test that the delay stated in the error message is used."""
+        error = create_rate_limit_error(message=message)
+        assert get_retry_delay(error=error, attempt=0) == pytest.approx(expected)
+
+    @pytest.mark.parametrize(argnames=["attempt"], argvalues=[(0,), (1,), (3,), (10,)])
+    def test_exponential_backoff(self, attempt):
+        """Test that exponential backoff is used if no delay is suggested."""
+        request = httpx.Request(method="POST", url="https://api.openai.com")
+        error = APIConnectionError(request=request)
+        delay = get_retry_delay(error=error, attempt=attempt)
+        assert min(2**attempt, MAX_RETRY_DELAY) <= delay <= MAX_RETRY_DELAY
+
+
+@pytest.mark.parametrize(
+    argnames=["duration", "expected"],
+    argvalues=[("20ms", 0.02), ("1.5s", 1.5), ("6m0s", 360.0), ("1h2m3s", 3723.0)],
+)
+def test_parse_duration(duration, expected):
+    """Test that the durations in the rate limit headers are parsed correctly."""
+    assert parse_duration(duration=duration) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(argnames=["duration"], argvalues=[("",), ("10",), ("1d",)])
+def test_parse_invalid_duration(duration):
+    """Test that invalid durations raise an error."""
+    with pytest.raises(ValueError):
+        parse_duration(duration=duration)
+
+
+class TestRateLimiter:
+    """Unit tests for the `RateLimiter` class."""
+
+    def test_limits_unknown_initially(self):
+        """Test that no limits are known before any response has been seen."""
+        rate_limiter = RateLimiter()
+        assert rate_limiter.remaining_requests is None
+        assert rate_limiter.remaining_tokens is None
+
+    def test_update(self):
+        """Test that the limits are updated from the response headers."""
+        rate_limiter = RateLimiter()
+        rate_limiter.update(
+            headers=httpx.Headers(
+                {
+                    "x-ratelimit-remaining-requests": "59",
+                    "x-ratelimit-remaining-tokens": "149984",
+                    "x-ratelimit-reset-requests": "1s",
+                    "x-ratelimit-reset-tokens": "6m0s",
+                }
+            )
+        )
+        assert rate_limiter.remaining_requests == 59
+        assert rate_limiter.remaining_tokens == 149984
+        assert rate_limiter.tokens_reset_time > rate_limiter.requests_reset_time
+
+    def test_acquire_reserves_tokens(self):
+        """Test that acquiring reserves a request along with its tokens."""
+        rate_limiter = RateLimiter()
+        rate_limiter.update(
+            headers=httpx.Headers(
+                {
+                    "x-ratelimit-remaining-requests": "10",
+                    "x-ratelimit-remaining-tokens": "1000",
+                }
+            )
+        )
+        asyncio.run(rate_limiter.acquire(num_tokens=100))
+        assert rate_limiter.remaining_requests == 9
+        assert rate_limiter.remaining_tokens == 900
+
+    @pytest.mark.parametrize(
+        argnames=["reset_duration", "remaining_requests", "remaining_tokens"],
+        argvalues=[
+            ("20ms", 0, 1000),
+            ("6m0s", 0, 1000),
+            ("20ms", 10, 50),
+            ("6m0s", 10, 50),
+        ],
+        ids=["requests", "requests capped", "tokens", "tokens capped"],
+    )
+    def test_acquire_waits_for_reset(
+        self, reset_duration, remaining_requests, remaining_tokens, monkeypatch
+    ):
+        """Test that acquiring waits for the window to reset, for a limited time."""
+        delays: list[float] = list()
+
+        async def sleep(delay: float) -> None:
+            delays.append(delay)
+
+        monkeypatch.setattr(openai_models.asyncio, "sleep", sleep)
+        rate_limiter = RateLimiter()
+        rate_limiter.update(
+            headers=httpx.Headers(
+                {
+                    "x-ratelimit-remaining-requests": str(remaining_requests),
+                    "x-ratelimit-remaining-tokens": str(remaining_tokens),
+                    "x-ratelimit-reset-requests": reset_duration,
+                    "x-ratelimit-reset-tokens": reset_duration,
+                }
+            )
+        )
+        asyncio.run(rate_limiter.acquire(num_tokens=100))
+        assert len(delays) == 1
+        expected_delay = min(parse_duration(duration=reset_duration), MAX_RETRY_DELAY)
+        assert 0 < delays[0] <= expected_delay
+        assert delays[0] == pytest.approx(expected_delay, abs=0.02)
+
+
+class TestOpenAITokenizerPad:
+    """Unit tests for the `pad` method of the `OpenAITokenizer` class."""
+
+    @pytest.mark.parametrize(
+        argnames=["input_id_lists", "expected"],
+        argvalues=[
+            ([[1, 2, 3], [4]], [[1, 2, 3], [PAD_TOKEN_ID, PAD_TOKEN_ID, 4]]),
+            ([[1], [2, 3], [4]], [[PAD_TOKEN_ID, 1], [2, 3], [PAD_TOKEN_ID, 4]]),
+            ([[1, 2], []], [[1, 2], [PAD_TOKEN_ID, PAD_TOKEN_ID]]),
+            ([[], []], [[], []]),
+        ],
+        ids=["two rows", "three rows", "zero-length row", "zero-length rows"],
+    )
+    def test_left_padding(self, input_id_lists, expected, tokenizer):
+        """Test that the examples are left-padded to the longest example."""
+        encoded_inputs = [dict(input_ids=input_ids) for input_ids in input_id_lists]
+        input_ids = tokenizer.pad(encoded_inputs=encoded_inputs).input_ids
+        assert input_ids.dtype == torch.int64
+        assert input_ids.shape == (len(expected), len(expected[0]))
+        assert input_ids.tolist() == expected
+
+    def test_batched_dict(self, tokenizer):
+        """Test that a dictionary with a batch of token ID lists is padded."""
+        input_ids = tokenizer.pad(
+            encoded_inputs=dict(input_ids=[[1, 2], [3]])
+        ).input_ids
+        assert input_ids.dtype == torch.int64
+        assert input_ids.tolist() == [[1, 2], [PAD_TOKEN_ID, 3]]
+
+    def test_empty_batch(self, tokenizer):
+        """Test that an empty batch gives an empty tensor."""
+        input_ids = tokenizer.pad(encoded_inputs=list()).input_ids
+        assert input_ids.dtype == torch.int64
+        assert input_ids.shape == (0, 0)
+
+    @pytest.mark.parametrize(
+        argnames=["pad_to_multiple_of", "expected_length"],
+        argvalues=[(None, 3), (1, 3), (2, 4), (3, 3), (4, 4), (8, 8)],
+    )
+    def test_pad_to_multiple_of(self, pad_to_multiple_of, expected_length, tokenizer):
+        """Test that the examples are left-padded to a multiple of the given value."""
+        input_ids = tokenizer.pad(
+            encoded_inputs=[dict(input_ids=[1, 2, 3]), dict(input_ids=[4])],
+            pad_to_multiple_of=pad_to_multiple_of,
+        ).input_ids
+        assert input_ids.shape == (2, expected_length)
+        assert input_ids[0, -3:].tolist() == [1, 2, 3]
+        assert input_ids[1, -1].item() == 4
+        assert (input_ids[0, :-3] == PAD_TOKEN_ID).all()
+        assert (input_ids[1, :-1] == PAD_TOKEN_ID).all()
+
+    @pytest.mark.parametrize(argnames=["pad_to_multiple_of"], argvalues=[(0,), (-2,)])
+    def test_invalid_pad_to_multiple_of(self, pad_to_multiple_of, tokenizer):
+        """Test that a non-positive `pad_to_multiple_of` raises an error."""
+        with pytest.raises(ValueError):
+            tokenizer.pad(
+                encoded_inputs=[dict(input_ids=[1, 2, 3]), dict(input_ids=[4])],
+                pad_to_multiple_of=pad_to_multiple_of,
+            )
+
+    def test_inputs_not_mutated(self, tokenizer):
+        """Test that the token ID lists of the caller are not changed."""
+        encoded_inputs = [dict(input_ids=[1, 2, 3]), dict(input_ids=[4])]
+        batched_inputs = dict(input_ids=[[1, 2, 3], [4]])
+        tokenizer.pad(encoded_inputs=encoded_inputs)
+        tokenizer.pad(encoded_inputs=batched_inputs)
+        assert encoded_inputs == [dict(input_ids=[1, 2, 3]), dict(input_ids=[4])]
+        assert batched_inputs == dict(input_ids=[[1, 2, 3], [4]])
+
+
+class TestOpenAIModelGenerate:
+    """Unit tests for the `generate` method of the `OpenAIModel` class."""
+
+    def test_one_completion_per_row(self, openai_model, tokenizer):
+        """Test that a padded batch gets a left-padded completion for every row."""
+        prompts = ["ab", "cd", "efgh"]
+        inputs = tokenizer(prompts).input_ids
+        output = openai_model.generate(inputs=inputs)
+        assert sorted(openai_model.prompts) == prompts
+        assert output.dtype == torch.long
+        assert output.shape == (3, 4)
+        assert decode_completions(output=output) == ["AB", "CD", "EFGH"]
+        assert output[0, :2].tolist() == [PAD_TOKEN_ID, PAD_TOKEN_ID]
+        assert output[1, :2].tolist() == [PAD_TOKEN_ID, PAD_TOKEN_ID]
+        assert PAD_TOKEN_ID not in output[2].tolist()
+
+    def test_completions_in_input_order(self, openai_model, tokenizer):
+        """Test that the longest prompts are sent first, in the original row order."""
+        prompts = ["abc", "a", "abcdef", "ab", "abcde"]
+        inputs = tokenizer(prompts).input_ids
+        output = openai_model.generate(inputs=inputs)
+        assert openai_model.prompts == ["abcdef", "abcde", "abc", "ab", "a"]
+        assert decode_completions(output=output) == [
+            prompt.upper() for prompt in prompts
+        ]
+
+    def test_no_empty_stop_sequences(self, openai_model, tokenizer):
+        """Test that missing special tokens are not used as stop sequences."""
+        assert tokenizer.eos_token == ""
+        openai_model.generate(inputs=tokenizer(["ab"]).input_ids)
+        assert openai_model.request_kwargs[0]["stop"] == ["\n\n", tokenizer.pad_token]
+
+    @pytest.mark.parametrize(
+        argnames=["input_shape", "expected_shape"],
+        argvalues=[((0,), (1, 0)), ((1, 0), (1, 0)), ((3, 0), (3, 0))],
+    )
+    @pytest.mark.parametrize(argnames=["return_dict"], argvalues=[(False,), (True,)])
+    def test_empty_inputs(self, input_shape, expected_shape, return_dict, openai_model):
+        """Test that empty inputs give empty completions, without any requests."""
+        inputs = torch.empty(input_shape, dtype=torch.long)
+        output = openai_model.generate(
+            inputs=inputs, return_dict_in_generate=return_dict
+        )
+        if return_dict:
+            assert isinstance(output, ModelOutput)
+            output = output["sequences"]
+        assert output.shape == expected_shape
+        assert output.dtype == torch.long
+        assert openai_model.prompts == []
+
+    def test_failed_request_cancels_pending_requests(self, openai_model, tokenizer):
+        """Test that the pending requests are cancelled if a request fails."""
+        cancelled_prompts: list[str] = list()
+
+        async def request_completion(prompt: str, **generation_kwargs) -> str:
+            if prompt == "a":
+                await asyncio.sleep(0)
+                raise InvalidBenchmark("Request failed")
+            try:
+                await asyncio.get_running_loop().create_future()
+            except asyncio.CancelledError:
+                cancelled_prompts.append(prompt)
+                raise
+            return prompt.upper()
+
+        openai_model._request_completion = request_completion
+        with pytest.raises(InvalidBenchmark, match="Request failed"):
+            openai_model.generate(inputs=tokenizer(["bb", "a", "cc"]).input_ids)
+        assert sorted(cancelled_prompts) == ["bb", "cc"]
+
+
+class TestInitializeAsyncOpenAIClient:
+    """Unit tests for the `_initialize_async_openai_client` method."""
+
+    def test_uses_aiohttp_client(self, openai_model, benchmark_config):
+        """Test that the aiohttp client is used, with a large enough connection pool."""
+        httpx_aiohttp = pytest.importorskip("httpx_aiohttp")
+        openai_model.benchmark_config = replace(
+            benchmark_config, openai_api_key="openai-api-key", max_concurrency=150
+        )
+        http_client = openai_model._initialize_async_openai_client()._client
+        assert isinstance(http_client, httpx_aiohttp.HttpxAiohttpClient)
+        assert http_client._transport.limits.max_connections == 300
+        assert http_client._transport.limits.max_keepalive_connections == 150
+
+
+class TestOpenAIModelDel:
+    """Unit tests for the `__del__` method of the `OpenAIModel` class."""
+
+    def test_closes_client_and_event_loop(self, openai_model):
+        """Test that the asynchronous client and the event loop are closed."""
+        openai_model.async_client = FakeAsyncClient()
+        openai_model.__del__()
+        assert openai_model.async_client.closed
+        assert openai_model._event_loop.is_closed()
+
+    def test_closes_client_within_running_event_loop(self, openai_model):
+        """Test that the client is closed if an event loop is already running."""
+        openai_model.async_client = FakeAsyncClient()
+
+        async def delete_model() -> None:
+            openai_model.__del__()
+
+        asyncio.run(delete_model())
+        assert openai_model.async_client.closed
+        assert openai_model._event_loop.is_closed()
+
+
+class TestOpenAIModelGenerateSingle:
+    """Unit tests for the `_generate_single` method of the `OpenAIModel` class."""
+
+    @pytest.fixture
+    def delays(self, monkeypatch) -> Generator[list[float], None, None]:
+        """Yields the delays slept between the attempts, without actually sleeping."""
+        delays: list[float] = list()
+
+        async def sleep(delay: float) -> None:
+            delays.append(delay)
+
+        monkeypatch.setattr(openai_models.asyncio, "sleep", sleep)
+        yield delays
+
+    @pytest.mark.parametrize(
+        argnames=["errors"],
+        argvalues=[
+            ([create_rate_limit_error(message="Please try again in 20s.")],),
+            ([create_connection_error()],),
+            ([create_connection_error(), create_rate_limit_error(message="Limit")],),
+        ],
+        ids=["rate limit", "connection", "connection and rate limit"],
+    )
+    def test_retries_until_success(self, errors, openai_model, delays):
+        """Test that requests failing with a retryable error are retried."""
+        fail_requests(model=openai_model, errors=errors)
+        completion = asyncio.run(
+            openai_model._generate_single(prompt="ab", num_tokens=3)
+        )
+        assert completion == "AB"
+        assert openai_model.prompts == ["ab"] * (len(errors) + 1)
+        assert len(delays) == len(errors)
+
+    def test_bad_request_returns_blank_string(self, openai_model, delays):
+        """Test that a bad request gives a blank completion, without retrying."""
+        fail_requests(
+            model=openai_model,
+            errors=[create_bad_request_error(message="Content filtered")],
+        )
+        completion = asyncio.run(
+            openai_model._generate_single(prompt="ab", num_tokens=3)
+        )
+        assert completion == " "
+        assert openai_model.prompts == ["ab"]
+        assert delays == []
+
+    def test_raises_after_max_attempts(self, openai_model, delays):
+        """Test that an error is raised when all the attempts have failed."""
+        errors = [create_connection_error() for _ in range(MAX_API_ATTEMPTS)]
+        fail_requests(model=openai_model, errors=errors)
+        with pytest.raises(InvalidBenchmark) as exc_info:
+            asyncio.run(openai_model._generate_single(prompt="ab", num_tokens=3))
+        assert exc_info.value.__cause__ is errors[-1]
+        assert len(openai_model.prompts) == MAX_API_ATTEMPTS
+        assert len(delays) == MAX_API_ATTEMPTS - 1
+
+
+class TestOpenAIModelIsChatModel:
+    """Unit tests for the `_is_chat_model` method of the `OpenAIModel` class."""
+
+    @pytest.fixture(autouse=True)
+    def empty_caches(self, monkeypatch) -> None:
+        """Empty the caches of the API probes."""
+        monkeypatch.setattr(openai_models, "IS_CHAT_MODEL_CACHE", dict())
+        monkeypatch.setattr(openai_models, "SUPPORTS_JSON_MODE_CACHE", dict())
+
+    @pytest.fixture
+    def azure_benchmark_config(
+        self, benchmark_config
+    ) -> Generator[BenchmarkConfig, None, None]:
+        """Yields a benchmark configuration using the Azure OpenAI API."""
+        yield replace(
+            benchmark_config,
+            openai_api_key=None,
+            azure_openai_api_key="azure-openai-api-key",
+            azure_openai_endpoint="https://azure-openai-endpoint",
+            azure_openai_api_version="2024-02-01",
+        )
+
+    @pytest.mark.parametrize(
+        argnames=["model_id", "is_chat_model", "num_requests"],
+        argvalues=[
+            ("gpt-3.5-turbo-instruct", False, 1),
+            ("davinci-002", False, 1),
+            ("gpt-4o", True, 0),
+            ("gpt-3.5-turbo-0125", True, 0),
+            ("o1-mini", True, 0),
+            ("chatgpt-4o-latest", True, 0),
+        ],
+    )
+    def test_openai_model_ids(
+        self,
+        model_id,
+        is_chat_model,
+        num_requests,
+        openai_model,
+        model_config,
+        benchmark_config,
+    ):
+        """Test that only unknown OpenAI model IDs are probed."""
+        openai_model.model_config = replace(model_config, model_id=model_id)
+        openai_model.benchmark_config = replace(
+            benchmark_config, openai_api_key="openai-api-key"
+        )
+        openai_model.client = FakeOpenAIClient(is_chat_model=is_chat_model)
+        assert openai_model._is_chat_model() == is_chat_model
+        assert openai_model.client.num_requests == num_requests
+
+    @pytest.mark.parametrize(
+        argnames=["model_id", "is_chat_model"],
+        argvalues=[("gpt-4o", True), ("my-deployment", True), ("davinci-002", False)],
+    )
+    def test_azure_always_probes(
+        self,
+        model_id,
+        is_chat_model,
+        openai_model,
+        model_config,
+        azure_benchmark_config,
+    ):
+        """Test that the API is always probed with Azure, as the IDs are deployments."""
+        openai_model.model_config = replace(model_config, model_id=model_id)
+        openai_model.benchmark_config = azure_benchmark_config
+        openai_model.client = FakeOpenAIClient(is_chat_model=is_chat_model)
+        assert openai_model._is_chat_model() == is_chat_model
+        assert openai_model.client.num_requests == 1
+
+    def test_probes_are_cached(
+        self, openai_model, model_config, azure_benchmark_config
+    ):
+        """Test that the probes are not repeated for another model instance."""
+        openai_model.model_config = replace(model_config, model_id="my-deployment")
+        openai_model.benchmark_config = azure_benchmark_config
+        for model, expected_num_requests in [
+            (openai_model, 2),
+            (copy(openai_model), 0),
+        ]:
+            model.client = FakeOpenAIClient(is_chat_model=True)
+            model.is_chat_model = model._is_chat_model()
+            model.supports_json_mode = model._supports_json_mode()
+            assert model.is_chat_model
+            assert model.supports_json_mode
+            assert model.client.num_requests == expected_num_requests
@@ -1,11 +1,15 @@
 """Unit tests for the `utils` module."""
 
+import logging
+import os
 import random
 
 import numpy as np
 import pytest
 import torch
 from scandeval.utils import (
+    configure_logging,
+    configure_runtime_environment,
     convert_prompt_to_instruction,
     enforce_reproducibility,
     get_end_of_chat_token_ids,
@@ -72,6 +76,65 @@ def test_module_is_installed(module_name, expected):
     assert is_module_installed(module_name) == expected
 
 
+class TestConfigureLogging:
+    """Unit tests for the `configure_logging` function."""
+
+    @pytest.fixture
+    def scandeval_logger(self, monkeypatch):
+        """Yields the ScandEval logger, with its handlers restored afterwards."""
+        scandeval_logger = logging.getLogger("scandeval")
+        monkeypatch.setattr(scandeval_logger, "handlers", [logging.NullHandler()])
+        monkeypatch.setattr(scandeval_logger, "propagate", True)
+        yield scandeval_logger
+
+    def test_adds_handler(self, scandeval_logger, monkeypatch):
+        """Test that a handler is added if the root logger has not been configured."""
+        monkeypatch.setattr(logging.getLogger(), "handlers", [])
+        configure_logging()
+        configure_logging()
+        stream_handlers = [
+            handler
+            for handler in scandeval_logger.handlers
+            if isinstance(handler, logging.StreamHandler)
+        ]
+        assert len(stream_handlers) == 1
+        assert not scandeval_logger.propagate
+
+    def test_keeps_root_logger_configuration(self, scandeval_logger, monkeypatch):
+        """Test that no handler is added if the root logger has been configured."""
+        monkeypatch.setattr(logging.getLogger(), "handlers", [logging.StreamHandler()])
+        configure_logging()
+        assert not any(
+            isinstance(handler, logging.StreamHandler)
+            for handler in scandeval_logger.handlers
+        )
+        assert scandeval_logger.propagate
+
+
+class TestConfigureRuntimeEnvironment:
+    """Unit tests for the `configure_runtime_environment` function."""
+
+    def test_sets_defaults(self, monkeypatch):
+        """Test that the environment variables are set if they are not set already."""
+        monkeypatch.delenv("TOKENIZERS_PARALLELISM", raising=False)
+        monkeypatch.delenv("PYTORCH_ENABLE_MPS_FALLBACK", raising=False)
+        monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+        configure_runtime_environment()
+        assert os.environ["TOKENIZERS_PARALLELISM"] == "false"
+        assert os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] == "1"
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+
+    def test_keeps_user_values(self, monkeypatch):
+        """Test that environment variables set by the user are not overwritten."""
+        monkeypatch.setenv("TOKENIZERS_PARALLELISM", "true")
+        monkeypatch.setenv("PYTORCH_ENABLE_MPS_FALLBACK", "0")
+        monkeypatch.setenv("OMP_NUM_THREADS", "8")
+        configure_runtime_environment()
+        assert os.environ["TOKENIZERS_PARALLELISM"] == "true"
+        assert os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] == "0"
+        assert os.environ["OMP_NUM_THREADS"] == "8"
+
+
 @pytest.mark.parametrize(
     argnames=["model_id", "expected"],
     argvalues=[